@@ -1,21 +1,61 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from functools import lru_cache
+from datetime import datetime
 from pptx import Presentation
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+import collections
+import hashlib
+import threading
+
+try:
+    # PNG 전용 고속 인코더 (선택 설치) — zlib보다 2~5배 빠름
+    import fpng_py
+except ImportError:
+    fpng_py = None
+import concurrent.futures
 import io
+import os
+import re
+import tempfile
+import textwrap
+import zipfile
 
 app = FastAPI()
 
+# 렌더링에 사용할 폰트 후보 경로 (한글 지원 폰트 우선)
+FONT_PATHS = (
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+)
+
+@lru_cache(maxsize=16)
+def _get_font(size):
+    """폰트 파일을 한 번만 열어 캐시합니다 (슬라이드마다 TTF를 다시 파싱하지 않도록)."""
+    for font_path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
 # CORS 설정
+# allow_credentials=True와 "*"를 같이 쓰면 보안 문제인 데다 Starlette이 매 요청
+# 와일드카드+자격증명 조정 경로를 타게 되므로, 실제 오리진만 명시합니다.
+# ("https://*.vercel.app" 같은 와일드카드 문자열은 allow_origins에서 동작하지 않음)
 origins = [
     "http://localhost:5173",
     "http://localhost:3000",
-    "https://*.vercel.app",
-    "*"
 ]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    allow_origin_regex=r"https://.*\.vercel\.app",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -25,11 +65,16 @@ app.add_middleware(
 async def get_slide_info(file: UploadFile = File(...)):
     """PPT 파일에서 슬라이드 개수 정보를 반환합니다."""
     try:
-        pptx_content = await file.read()
-        prs = Presentation(io.BytesIO(pptx_content))
-        
-        slide_count = len(prs.slides)
-        
+        spool, digest = await _read_upload(file)
+        with spool:
+            cached = _text_cache.get(digest)
+            if cached is not None:
+                slide_count = len(cached)
+            else:
+                # 개수만 필요하므로 전체 파싱 대신 슬라이드 목록 XML 하나만 읽어 셈
+                with zipfile.ZipFile(spool) as pptx_zip:
+                    slide_count = pptx_zip.read("ppt/presentation.xml").count(b"<p:sldId ")
+
         return {
             "slide_count": slide_count,
             "filename": file.filename
@@ -44,24 +89,24 @@ async def get_slide_text(
 ):
     """슬라이드의 텍스트 정보만 반환 (클라이언트 렌더링용)"""
     try:
-        contents = await file.read()
-        prs = Presentation(io.BytesIO(contents))
-        
-        if not (0 <= slide_index < len(prs.slides)):
+        spool, digest = await _read_upload(file)
+        with spool:
+            texts = _extract_texts(spool, digest)
+
+        if not (0 <= slide_index < len(texts)):
             raise HTTPException(status_code=400, detail="Invalid slide index")
-            
-        slide = prs.slides[slide_index]
-        text_blocks = []
-        
+
         # 각 텍스트 박스의 정보를 수집
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                text_blocks.append({
-                    "text": shape.text,
-                    "font_size": 16,  # 기본 폰트 크기
-                    "bold": False
-                })
-        
+        text_blocks = [
+            {
+                "text": shape_text,
+                "font_size": 16,  # 기본 폰트 크기
+                "bold": False
+            }
+            for shape_text in texts[slide_index]
+        ]
+
+
         return {
             "slide_index": slide_index,
             "text_blocks": text_blocks,
@@ -70,6 +115,327 @@ async def get_slide_text(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error extracting slide text: {e}")
 
+@app.post("/api/slides-text")
+async def get_slides_text(file: UploadFile = File(...)):
+    """모든 슬라이드의 텍스트를 한 번의 요청으로 반환합니다 (클라이언트 렌더링용).
+
+    슬라이드별로 /get-slide-text를 N번 호출하는 대신 파싱 한 번으로 끝냅니다.
+    """
+    try:
+        spool, digest = await _read_upload(file)
+        with spool:
+            texts = _extract_texts(spool, digest)
+
+        slides = [
+            {
+                "slide_index": i,
+                "text_blocks": [
+                    {
+                        "text": shape_text,
+                        "font_size": 16,  # 기본 폰트 크기
+                        "bold": False
+                    }
+                    for shape_text in shape_texts
+                ],
+                "full_text": "\n".join(shape_texts) if shape_texts else f"Slide {i + 1}"
+            }
+            for i, shape_texts in enumerate(texts)
+        ]
+        return {"slides": slides}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error extracting slides text: {e}")
+
+# 같은 파일로 /slide-info → /get-slide-text → /process-ppt를 연달아 호출해도
+# PPTX 파싱은 한 번만 하도록, 파일 해시를 키로 추출 결과를 캐시
+_text_cache = collections.OrderedDict()
+_TEXT_CACHE_MAX = 32
+
+async def _read_upload(file):
+    """업로드를 1MB 청크 단위로 스풀 파일에 받으며 sha256을 누적 계산합니다.
+
+    전체 파일을 한 번에 메모리에 올리지 않고, 8MB를 넘는 파일은 디스크로
+    흘러넘치므로 peak 메모리가 업로드 크기와 무관해집니다.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    hasher = hashlib.sha256()
+    while True:
+        chunk = await file.read(1024 * 1024)
+        if not chunk:
+            break
+        spool.write(chunk)
+        hasher.update(chunk)
+    spool.seek(0)
+    return spool, hasher.digest()
+
+def _extract_texts(pptx_file, key):
+    """PPTX 파일 객체에서 슬라이드별 텍스트를 추출합니다 (파일 해시로 LRU 캐시).
+
+    슬라이드마다 도형별 텍스트 튜플을 담은 튜플을 반환합니다.
+    """
+    cached = _text_cache.get(key)
+    if cached is not None:
+        _text_cache.move_to_end(key)
+        return cached
+
+    prs = Presentation(pptx_file)
+    texts = []
+    for slide in prs.slides:
+        shape_texts = []
+        for shape in slide.shapes:
+            # hasattr(shape, "text")는 shape.text 프로퍼티 해석(XML 순회)을 유발하므로
+            # 값싼 has_text_frame으로 거르고 run들을 StringIO에 직접 모음
+            if not shape.has_text_frame:
+                continue
+            buf = io.StringIO()
+            for i, paragraph in enumerate(shape.text_frame.paragraphs):
+                if i:
+                    buf.write("\n")
+                for run in paragraph.runs:
+                    buf.write(run.text)
+            shape_text = buf.getvalue()
+            if shape_text.strip():
+                shape_texts.append(shape_text)
+        texts.append(tuple(shape_texts))
+    texts = tuple(texts)
+
+    _text_cache[key] = texts
+    if len(_text_cache) > _TEXT_CACHE_MAX:
+        _text_cache.popitem(last=False)
+    return texts
+
+@lru_cache(maxsize=_TEXT_CACHE_MAX)
+def _joined_texts(texts):
+    """슬라이드별 도형 텍스트 튜플을 렌더링용 전체 문자열 튜플로 만듭니다 (캐시).
+
+    같은 덱을 다시 렌더링할 때 슬라이드마다 join을 반복하지 않습니다.
+    """
+    return tuple("\n".join(shape_texts) for shape_texts in texts)
+
+# 렌더링 캔버스 크기
+CANVAS_SIZE = (1280, 720)
+
+# Image.new는 슬라이드마다 ~2.6MB를 새로 할당하므로 스레드별로 픽셀 버퍼 하나를 재사용
+_canvas_local = threading.local()
+
+def _get_canvas(bg_color):
+    """스레드 로컬 NumPy 버퍼를 배경색으로 채운 캔버스를 (img, draw)로 반환합니다.
+
+    배경 채움은 NumPy 브로드캐스트(벡터화된 memset)로 처리하고, 채워진 버퍼를
+    Image.frombuffer로 감싸 PIL의 픽셀 단위 초기화 경로를 건너뜁니다.
+    """
+    pixels = getattr(_canvas_local, "pixels", None)
+    if pixels is None:
+        pixels = np.empty((CANVAS_SIZE[1], CANVAS_SIZE[0], 3), dtype=np.uint8)
+        _canvas_local.pixels = pixels
+    pixels[:] = bg_color
+    img = Image.frombuffer("RGB", CANVAS_SIZE, pixels, "raw", "RGB", 0, 1)
+    img.readonly = 0
+    return img, ImageDraw.Draw(img)
+
+def _encode_png(img):
+    """캔버스를 PNG 바이트로 인코딩합니다.
+
+    fpng_py가 설치돼 있으면 PNG 전용 인코더(fpng)를 사용하고,
+    없으면 Pillow로 인코딩합니다. 흰 배경 위주의 슬라이드는 compress_level
+    1과 6의 크기 차이가 거의 없는 반면 zlib CPU 시간은 3~4배 차이가 나므로
+    빠른 쪽을 사용합니다.
+    """
+    if fpng_py is not None:
+        width, height = img.size
+        return fpng_py.fpng_encode_image_to_memory(img.tobytes(), width, height, 3)
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format="PNG", compress_level=1, optimize=False)
+    return img_buffer.getvalue()
+
+class _ChunkBuffer(io.RawIOBase):
+    """zipfile이 쓰는 바이트를 모아뒀다가 스트리밍 응답으로 흘려보내는 버퍼."""
+
+    def __init__(self):
+        self._chunks = collections.deque()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        """지금까지 쌓인 바이트를 모두 꺼내고 버퍼를 비웁니다."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+@lru_cache(maxsize=256)
+def hex_to_rgb(hex_color):
+    """'#RRGGBB' 또는 '#RGB' 색상 문자열을 RGB 튜플로 변환합니다.
+
+    슬라이스 3번 + int 파싱 3번 대신 int 파싱 한 번과 비트 시프트로 처리하고,
+    사용자들이 보내는 색상은 몇 가지로 반복되므로 결과를 캐시합니다.
+    """
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = hex_color[0] * 2 + hex_color[1] * 2 + hex_color[2] * 2
+    if len(hex_color) != 6:
+        return (255, 255, 255)
+    value = int(hex_color, 16)
+    return (value >> 16 & 0xFF, value >> 8 & 0xFF, value & 0xFF)
+
+@lru_cache(maxsize=32)
+def _keyword_pattern(keywords):
+    """키워드들을 대소문자 무시 단일 정규식으로 컴파일합니다 (요청 간 캐시).
+
+    같은 키워드 조합을 반복 사용하는 사용자는 컴파일 비용을 다시 내지 않습니다.
+    다중 패턴 스캔 자체는 컴파일된 정규식이 C 수준 단일 패스로 처리하고,
+    긴 키워드를 앞에 배치해 겹치는 키워드는 항상 가장 긴 일치를 강조합니다.
+    """
+    if not keywords:
+        return None
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+def draw_text_with_highlights(draw, pos, line, font, text_color, highlight_pattern, highlight_color):
+    """키워드와 일치하는 구간만 강조 색상으로 그립니다.
+
+    단어×키워드 이중 루프 대신 컴파일된 정규식으로 한 번에 스캔하고,
+    일치/비일치 구간(run)을 통째로 그려 draw.text 호출 수도 줄입니다.
+    """
+    x, y = pos
+    if highlight_pattern is None:
+        draw.text((x, y), line, fill=text_color, font=font)
+        return
+
+    last_end = 0
+    for match in highlight_pattern.finditer(line):
+        if match.start() > last_end:
+            segment = line[last_end:match.start()]
+            draw.text((x, y), segment, fill=text_color, font=font)
+            x += draw.textlength(segment, font=font)
+        draw.text((x, y), match.group(), fill=highlight_color, font=font)
+        x += draw.textlength(match.group(), font=font)
+        last_end = match.end()
+    if last_end < len(line):
+        draw.text((x, y), line[last_end:], fill=text_color, font=font)
+
+def render_slide(slide_text, slide_number, bg_color, text_color, highlight_pattern, highlight_color, font):
+    """슬라이드 텍스트를 1280x720 PNG 바이트로 렌더링합니다.
+
+    폰트는 호출자가 요청당 한 번만 해석해서 넘깁니다.
+    python-pptx 객체를 전혀 만지지 않는 순수 함수라 스레드 풀에서 안전하게 실행됩니다.
+    """
+    img, draw = _get_canvas(bg_color)
+
+    slide_text = slide_text or f"Slide {slide_number}"
+    y = 50
+    for line in slide_text.split("\n"):
+        # textwrap.wrap은 C 수준 구현이라 단어 누적 루프의 O(L^2) 문자열 연결이 없음
+        for wrapped_line in textwrap.wrap(line, width=50) or [""]:
+            draw_text_with_highlights(draw, (50, y), wrapped_line, font, text_color, highlight_pattern, highlight_color)
+            y += 60
+
+    return _encode_png(img)
+
+@app.post("/api/process-ppt")
+async def process_ppt(
+    file: UploadFile = File(...),
+    slide_indices: str = Form(...),
+    bg_color: str = Form("#FFFFFF"),
+    text_color: str = Form("#000000"),
+    highlight_keywords: str = Form(""),
+    highlight_color: str = Form("#FF0000")
+):
+    """선택한 슬라이드들을 PNG로 렌더링하여 ZIP으로 반환합니다."""
+    try:
+        spool, digest = await _read_upload(file)
+        with spool:
+            all_texts = _extract_texts(spool, digest)
+
+        sorted_indices = sorted({int(i) for i in slide_indices.split(',') if i.strip()})
+        sorted_indices = [i for i in sorted_indices if 0 <= i < len(all_texts)]
+        if not sorted_indices:
+            raise HTTPException(status_code=400, detail="No valid slide indices")
+
+        bg = hex_to_rgb(bg_color)
+        txt = hex_to_rgb(text_color)
+        highlight = hex_to_rgb(highlight_color)
+        # 정규식은 요청당 한 번만 컴파일해서 모든 슬라이드가 공유
+        keywords = [k.strip() for k in highlight_keywords.split(',') if k.strip()]
+        pattern = _keyword_pattern(tuple(keywords))
+
+        # 렌더링 전에 텍스트를 모두 준비 (추출/join 모두 캐시에서 이미 끝난 상태)
+        joined = _joined_texts(all_texts)
+        texts = [joined[slide_index] for slide_index in sorted_indices]
+
+        date_prefix = datetime.now().strftime('%m-%d')
+
+        # 슬라이드가 완성되는 대로 ZIP 바이트를 흘려보내는 제너레이터.
+        # 전체 아카이브를 메모리에 쌓지 않아 메모리 사용량이 PNG 한 장 수준으로 유지되고,
+        # 첫 슬라이드가 끝나는 즉시 첫 바이트가 클라이언트로 나갑니다.
+        # (동기 제너레이터는 Starlette이 스레드 풀에서 돌리므로 이벤트 루프를 막지 않습니다.)
+        # 폰트 해석은 요청당 한 번 (루프/스레드 안에서 반복하지 않음)
+        font = _get_font(40)
+
+        def zip_stream():
+            args = [
+                (text, slide_index + 1, bg, txt, pattern, highlight, font)
+                for text, slide_index in zip(texts, sorted_indices)
+            ]
+            chunk_buffer = _ChunkBuffer()
+            # PNG 인코딩(zlib)은 GIL을 해제하므로 스레드 풀로 렌더링을 병렬화.
+            # executor.map은 완성 순서대로 결과를 내보내고,
+            # zipfile은 스레드 세이프하지 않으므로 기록은 순차적으로 수행
+            with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                renders = executor.map(lambda a: render_slide(*a), args)
+                # PNG는 이미 DEFLATE로 압축돼 있어 ZIP 단계에서 다시 압축할 이유가 없음
+                with zipfile.ZipFile(chunk_buffer, "w", zipfile.ZIP_STORED) as zip_file:
+                    for slide_index, png_bytes in zip(sorted_indices, renders):
+                        zip_file.writestr(f"{date_prefix}_slide_{slide_index + 1}.png", png_bytes)
+                        yield chunk_buffer.drain()
+            # ZipFile을 닫을 때 기록되는 central directory까지 내보냄
+            yield chunk_buffer.drain()
+
+        return StreamingResponse(
+            zip_stream(),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f"attachment; filename=slides_{date_prefix}.zip",
+                # PNG가 이미 압축돼 있으므로 gzip 미들웨어/프록시의 재압축을 건너뜀
+                "Content-Encoding": "identity",
+                "Cache-Control": "no-transform",
+                "Accept-Ranges": "none",
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing PPT: {e}")
+
+@app.post("/api/get-slide-image")
+async def get_slide_image(
+    file: UploadFile = File(...),
+    slide_index: int = Form(...)
+):
+    """슬라이드를 PNG 이미지로 렌더링하여 반환합니다."""
+    try:
+        spool, digest = await _read_upload(file)
+        with spool:
+            texts = _extract_texts(spool, digest)
+
+        if not (0 <= slide_index < len(texts)):
+            raise HTTPException(status_code=400, detail="Invalid slide index")
+
+        slide_text = _joined_texts(texts)[slide_index]
+
+        # 렌더링 로직은 process_ppt와 동일한 render_slide 하나로 공유
+        png_bytes = render_slide(slide_text, slide_index + 1, (255, 255, 255), (0, 0, 0), None, None, _get_font(40))
+
+        # base64+JSON 왕복 없이 PNG 바이트를 그대로 반환 (payload 25% 감소)
+        return Response(
+            content=png_bytes,
+            media_type="image/png",
+            headers={"Cache-Control": "public, max-age=300"}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rendering slide image: {e}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
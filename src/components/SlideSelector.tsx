@@ -145,44 +145,36 @@ const SlideSelector: React.FC<SlideSelectorProps> = ({ file, slideCount }) => {
     return editedSlideData[slideIndex] || slideTextData[slideIndex] || null;
   };
 
-  // 슬라이드 텍스트 데이터를 로드하는 함수
-  const fetchSlideText = async (index: number) => {
-    if (slideTextData[index] || loadingSlides.has(index)) return;
-
-    setLoadingSlides(prev => new Set(prev).add(index));
+  // 모든 슬라이드 텍스트 데이터를 한 번의 요청으로 로드하는 함수
+  const fetchAllSlideTexts = async () => {
+    setLoadingSlides(new Set(Array.from({ length: slideCount }, (_, i) => i)));
 
     const formData = new FormData();
     formData.append('file', file);
-    formData.append('slide_index', index.toString());
 
     try {
-      const response = await axios.post('/api/get-slide-text', formData, {
+      const response = await axios.post('/api/slides-text', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
-      
-      setSlideTextData(prev => ({
-        ...prev,
-        [index]: response.data
-      }));
-      setLoadedCount(prev => prev + 1);
+
+      const textData: { [key: number]: SlideTextData } = {};
+      for (const slide of response.data.slides as SlideTextData[]) {
+        textData[slide.slide_index] = slide;
+      }
+      setSlideTextData(textData);
+      setLoadedCount(response.data.slides.length);
     } catch (error) {
-      console.error(`Error fetching slide text ${index + 1}:`, error);
+      console.error('Error fetching slide texts:', error);
     } finally {
-      setLoadingSlides(prev => {
-        const newSet = new Set(prev);
-        newSet.delete(index);
-        return newSet;
-      });
+      setLoadingSlides(new Set());
     }
   };
 
   // 컴포넌트 마운트 시 모든 슬라이드 텍스트 데이터 로드
   useEffect(() => {
-    for (let i = 0; i < slideCount; i++) {
-      fetchSlideText(i);
-    }
+    fetchAllSlideTexts();
   }, [file, slideCount]);
 
   // 슬라이드 선택/해제
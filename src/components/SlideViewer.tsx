@@ -29,8 +29,10 @@ const SlideViewer: React.FC<SlideViewerProps> = ({ file, slideCount }) => {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
+        responseType: 'blob',
       });
-      setSlideImage(`data:image/png;base64,${response.data.image}`);
+      // 서버가 PNG 바이너리를 그대로 반환하므로 base64 디코딩 없이 바로 표시
+      setSlideImage(URL.createObjectURL(response.data));
     } catch (err) {
       console.error('Error fetching slide image:', err);
       setError('슬라이드 이미지를 불러오는 데 실패했습니다.');
@@ -45,6 +47,15 @@ const SlideViewer: React.FC<SlideViewerProps> = ({ file, slideCount }) => {
     }
   }, [file, slideCount, currentSlideIndex, fetchSlideImage]);
 
+  // object URL 누수 방지
+  useEffect(() => {
+    return () => {
+      if (slideImage) {
+        URL.revokeObjectURL(slideImage);
+      }
+    };
+  }, [slideImage]);
+
   const handlePrev = () => {
     setCurrentSlideIndex((prevIndex) => Math.max(0, prevIndex - 1));
   };